@@ -1,32 +1,112 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from math import factorial
-from typing import List, Tuple
-from collections import deque
+from typing import Optional, Tuple, Union
 
-def erlang_b_formula(A: float, S: int) -> float:
+try:
+    from numba import get_num_threads, njit, prange
+    from numba.typed import List as TypedList
+except ImportError:  # Numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+    def get_num_threads():
+        return 1
+    prange = range
+    TypedList = list
+
+# Number of random variates drawn per call to the generator
+RNG_BATCH_SIZE = 131072
+
+# Minimum arrivals per run for statistical significance
+MIN_ARRIVALS = 10000
+
+def erlang_b_formula(A: np.ndarray, S: int) -> np.ndarray:
     """
     Calculate blocking probability using Erlang B formula.
     
+    Uses the recurrence B(A, k) = A*B(A, k-1) / (k + A*B(A, k-1)) with
+    B(A, 0) = 1, which avoids computing A**S and S! directly and so never
+    overflows. Evaluated for all offered loads at once.
+    
     Args:
-        A (float): Offered load
+        A (np.ndarray): Offered loads
         S (int): Number of servers
     
     Returns:
-        float: Blocking probability
+        np.ndarray: Blocking probability for each offered load
     """
-    try:
-        numerator = (A ** S) / factorial(S)
-        denominator = sum((A ** k) / factorial(k) for k in range(S + 1))
-        return numerator / denominator
-    except OverflowError:
-        # Handle large numbers more efficiently
-        log_numerator = S * np.log(A) - np.log(factorial(S))
-        log_denominator = np.log(sum((A ** k) / factorial(k) for k in range(S + 1)))
-        return np.exp(log_numerator - log_denominator)
+    A = np.asarray(A, dtype=np.float64)
+    B = np.ones_like(A)
+    for k in range(1, S + 1):
+        B = A * B / (k + A * B)
+    return B
+
+@njit(cache=True)
+def _simulate(lambda_: float, mu: float, servers: int, simulation_time: float,
+              min_arrivals: int, rng: np.random.Generator) -> Tuple[int, int]:
+    """
+    Core M/M/S/S simulation loop, compiled with Numba when available.
+    
+    With no waiting room, departures only matter through how many servers
+    are busy when a customer arrives. Each server keeps the time its
+    current service ends; an arrival is served by the server that frees
+    up earliest, or blocked if even that one is still busy.
+    
+    Inter-arrival and service times are drawn from rng in blocks of
+    RNG_BATCH_SIZE and consumed by index, refilling when exhausted.
+    
+    If fewer than min_arrivals customers arrive before simulation_time,
+    the horizon is doubled and the run continues from its current state.
+    
+    Returns:
+        Tuple[int, int]: (Blocked arrivals, Total arrivals)
+    """
+    inv_lambda = 1.0 / lambda_
+    inv_mu = 1.0 / mu
+    inter_arrivals = rng.exponential(inv_lambda, RNG_BATCH_SIZE)
+    service_times = rng.exponential(inv_mu, RNG_BATCH_SIZE)
+    i_a = 0
+    i_s = 0
+    
+    departures = np.full(servers, -np.inf, dtype=np.float64)
+    total_arrivals = 0
+    blocked_arrivals = 0
+    
+    current_time = inter_arrivals[i_a]
+    i_a += 1
+    while True:
+        while current_time < simulation_time:
+            total_arrivals += 1
+            
+            idx = departures.argmin()
+            if departures[idx] <= current_time:
+                # A server is free - service can start
+                if i_s == RNG_BATCH_SIZE:
+                    service_times = rng.exponential(inv_mu, RNG_BATCH_SIZE)
+                    i_s = 0
+                departures[idx] = current_time + service_times[i_s]
+                i_s += 1
+            else:
+                # All servers busy - request blocked
+                blocked_arrivals += 1
+            
+            if i_a == RNG_BATCH_SIZE:
+                inter_arrivals = rng.exponential(inv_lambda, RNG_BATCH_SIZE)
+                i_a = 0
+            current_time += inter_arrivals[i_a]
+            i_a += 1
+        
+        # Ensure minimum number of arrivals for statistical significance
+        if total_arrivals >= min_arrivals:
+            break
+        simulation_time *= 2
+    
+    return blocked_arrivals, total_arrivals
 
 def simulate_blocking_probability(lambda_: float, mu: float, servers: int, 
-                               simulation_time: float) -> Tuple[float, int]:
+                               simulation_time: float,
+                               seed: Optional[Union[int, np.random.SeedSequence]] = None
+                               ) -> Tuple[float, int]:
     """
     Simulate M/M/S/S queue using discrete event simulation.
     
@@ -35,78 +115,54 @@ def simulate_blocking_probability(lambda_: float, mu: float, servers: int,
         mu: Service rate
         servers: Number of servers
         simulation_time: Total simulation time
+        seed: Seed for the random generator, for reproducible runs
     
     Returns:
         Tuple[float, int]: (Blocking probability, Total arrivals)
     """
-    class Event:
-        def __init__(self, time: float, event_type: str):
-            self.time = time
-            self.type = event_type
-        
-        def __lt__(self, other):
-            return self.time < other.time
-
-    # Initialize simulation variables
-    current_time = 0.0
-    servers_in_use = 0
-    total_arrivals = 0
-    blocked_arrivals = 0
+    # The kernel doubles the horizon until enough customers arrive, which
+    # never terminates for a non-positive horizon or rate
+    if lambda_ <= 0 or mu <= 0 or servers <= 0 or simulation_time <= 0:
+        raise ValueError("lambda_, mu, servers and simulation_time must be positive")
     
-    # Priority queue for events
-    events = []
+    rng = np.random.default_rng(seed)
+    blocked_arrivals, total_arrivals = _simulate(lambda_, mu, servers, simulation_time,
+                                                 MIN_ARRIVALS, rng)
     
-    # Schedule first arrival
-    events.append(Event(np.random.exponential(1/lambda_), "arrival"))
+    blocking_prob = blocked_arrivals / total_arrivals if total_arrivals > 0 else 0
+    return blocking_prob, total_arrivals
+
+@njit(parallel=True, cache=True)
+def _sweep(arrival_rates: np.ndarray, mu: float, servers: int, simulation_time: float,
+           min_arrivals: int, num_iterations: int, rngs: TypedList,
+           first_rng: int) -> np.ndarray:
+    """
+    Run the simulation replicas for a block of offered loads in parallel.
     
-    # Run simulation
-    while current_time < simulation_time:
-        if not events:
-            # If no events, generate new arrival
-            next_time = current_time + np.random.exponential(1/lambda_)
-            if next_time < simulation_time:
-                events.append(Event(next_time, "arrival"))
-            continue
-        
-        # Get next event
-        events.sort()  # Sort by time
-        event = events.pop(0)
-        current_time = event.time
-        
-        if current_time > simulation_time:
-            break
-            
-        if event.type == "arrival":
-            # Handle arrival
-            total_arrivals += 1
-            
-            # Schedule next arrival
-            next_arrival = current_time + np.random.exponential(1/lambda_)
-            if next_arrival < simulation_time:
-                events.append(Event(next_arrival, "arrival"))
-            
-            if servers_in_use < servers:
-                # Service can start
-                servers_in_use += 1
-                # Schedule departure
-                service_time = np.random.exponential(1/mu)
-                events.append(Event(current_time + service_time, "departure"))
-            else:
-                # All servers busy - request blocked
-                blocked_arrivals += 1
-                
-        else:  # departure
-            servers_in_use = max(0, servers_in_use - 1)
+    All (load, iteration) replicas are independent, so they are spread
+    over Numba's thread pool with prange; no pickling or worker processes
+    are involved. Falls back to a serial loop without Numba.
     
-    # Ensure minimum number of arrivals for statistical significance
-    min_arrivals = 10000
-    if total_arrivals < min_arrivals:
-        return simulate_blocking_probability(lambda_, mu, servers, simulation_time * 2)
+    Replica number task within the block draws from rngs[first_rng + task].
     
-    blocking_prob = blocked_arrivals / total_arrivals if total_arrivals > 0 else 0
-    return blocking_prob, total_arrivals
+    Returns:
+        np.ndarray: Blocking probabilities of shape
+        (len(arrival_rates), num_iterations)
+    """
+    blocking = np.empty((arrival_rates.shape[0], num_iterations))
+    for task in prange(arrival_rates.shape[0] * num_iterations):
+        i = task // num_iterations
+        j = task % num_iterations
+        # prange indices are unsigned; typed lists index with int64
+        rng = rngs[first_rng + np.int64(task)]
+        blocked_arrivals, total_arrivals = _simulate(
+            arrival_rates[i], mu, servers, simulation_time, min_arrivals, rng)
+        blocking[i, j] = blocked_arrivals / total_arrivals if total_arrivals > 0 else 0.0
+    return blocking
 
-def run_simulation(servers: int, lambda_: float, mu: float) -> tuple[List[float], List[float], List[float]]:
+def run_simulation(servers: int, lambda_: float, mu: float, num_iterations: int = 5,
+                   sim_time: float = 20000, num_loads: int = 40
+                   ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     Run simulation and calculate both theoretical and simulated blocking probabilities.
     
@@ -114,48 +170,56 @@ def run_simulation(servers: int, lambda_: float, mu: float) -> tuple[List[float]
         servers (int): Number of servers
         lambda_ (float): Base arrival rate
         mu (float): Service rate
+        num_iterations (int): Simulation runs averaged per offered load
+        sim_time (float): Simulated time horizon of each run
+        num_loads (int): Number of offered loads, spaced 0.5 apart
     
     Returns:
-        tuple: Lists of offered loads, theoretical blocking probs, and simulated blocking probs
+        tuple: Arrays of offered loads, theoretical blocking probs, and simulated blocking probs
     """
+    if servers <= 0 or mu <= 0 or num_iterations <= 0 or sim_time <= 0 or num_loads <= 0:
+        raise ValueError("servers, mu, num_iterations, sim_time and num_loads must be positive")
+    
     # Calculate offered loads
-    offered_loads = [(i + 1) * 0.5 for i in range(40)]  # More data points
+    offered_loads = 0.5 * np.arange(1, num_loads + 1, dtype=np.float64)
     
     # Calculate theoretical blocking probabilities
     print("\nCalculating theoretical probabilities...")
-    theoretical_blocking = [erlang_b_formula(A, servers) for A in offered_loads]
+    theoretical_blocking = erlang_b_formula(offered_loads, servers)
     
     # Simulate blocking probabilities
     print("Running simulation...")
-    simulated_blocking = []
-    total_samples = []
+    # One independent child seed per replica keeps runs reproducible
+    seeds = np.random.SeedSequence(42).spawn(num_loads * num_iterations)
+    rngs = TypedList([np.random.default_rng(seed) for seed in seeds])
+    # Adjust arrival rate to maintain desired offered load A
+    arrival_rates = offered_loads * mu
     
-    for i, A in enumerate(offered_loads):
-        # Adjust arrival rate to maintain desired offered load A
-        adjusted_lambda = A * mu
-        
-        # Run multiple iterations for each load point to get better average
-        num_iterations = 5
-        probs = []
-        for _ in range(num_iterations):
-            prob, samples = simulate_blocking_probability(adjusted_lambda, mu, servers, 20000)
-            probs.append(prob)
-            
-        avg_prob = np.mean(probs)
-        simulated_blocking.append(avg_prob)
-        print(f"Progress: {i+1}/{len(offered_loads)} simulations complete")
+    # Run the sweep in blocks of loads, each with enough replicas to keep
+    # every thread busy, and report progress between blocks
+    loads_per_block = -(-get_num_threads() // num_iterations)
+    simulated_blocking = np.empty(num_loads)
+    for start in range(0, num_loads, loads_per_block):
+        stop = min(start + loads_per_block, num_loads)
+        blocking = _sweep(arrival_rates[start:stop], mu, servers, sim_time, MIN_ARRIVALS,
+                          num_iterations, rngs, start * num_iterations)
+        simulated_blocking[start:stop] = blocking.mean(axis=1)
+        print(f"Progress: {stop}/{num_loads} simulations complete")
     
     return offered_loads, theoretical_blocking, simulated_blocking
 
-def plot_results(offered_loads: List[float], theoretical: List[float], simulated: List[float]) -> None:
+def plot_results(offered_loads: np.ndarray, theoretical: np.ndarray, simulated: np.ndarray) -> None:
     """
     Plot the comparison between theoretical and simulated results.
     
     Args:
-        offered_loads (List[float]): List of offered loads
-        theoretical (List[float]): List of theoretical blocking probabilities
-        simulated (List[float]): List of simulated blocking probabilities
+        offered_loads (np.ndarray): Offered loads
+        theoretical (np.ndarray): Theoretical blocking probabilities
+        simulated (np.ndarray): Simulated blocking probabilities
     """
+    # Imported here so the CLI starts without paying matplotlib's import cost
+    import matplotlib.pyplot as plt
+    
     plt.figure(figsize=(12, 8))
     plt.plot(offered_loads, theoretical, 'b-', label='Erlang B Formula', linewidth=2)
     plt.plot(offered_loads, simulated, 'r--', label='Simulation', linewidth=2)